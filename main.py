@@ -1,23 +1,76 @@
 import os
+import re
+import hashlib
 import sys
 import json
+import threading
 import traceback
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from io import BytesIO
 from pathlib import Path
-from typing import Dict, Any
+from stat import S_ISREG
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
 
 from loguru import logger
 from pptx import Presentation
 from pptx.enum.shapes import MSO_SHAPE_TYPE
-from PIL import Image
+from pptx.oxml.ns import qn
+from PIL import Image, UnidentifiedImageError
 
-logger.add(
-    sys.stderr,
-    format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <level>{message}</level>",
-    level="DEBUG",
-    backtrace=True,  # Show traceback for errors
-    diagnose=True,  # Show variables in traceback
-    catch=True,  # Catch exceptions in the logging handler
-)
+try:
+    import imagesize
+except ImportError:  # optional: header-only dimension reads, falls back to Pillow
+    imagesize = None
+
+try:
+    import re2 as _placeholder_re
+except ImportError:  # optional: linear-time matching for large placeholder sets, falls back to re
+    _placeholder_re = re
+
+# Recognized per-slide data sections and the PowerPointTemplate method that applies each one
+_SECTION_HANDLERS = {
+    "text": "_replace_text_placeholders",
+    "tables": "_update_tables",
+    "images": "_replace_images",
+}
+
+_PICTURE = MSO_SHAPE_TYPE.PICTURE
+_PLACEHOLDER = MSO_SHAPE_TYPE.PLACEHOLDER
+_A_R = qn("a:r")
+_A_T = qn("a:t")
+
+# Upper bound on threads used to process slides in parallel
+_MAX_SLIDE_WORKERS = 8
+
+# Buffer size for reading/writing PPTX zip streams
+_IO_BUFFER_SIZE = 1 << 20
+
+# Defers building per-placeholder debug arguments until a DEBUG sink actually accepts the record
+_lazy_logger = logger.opt(lazy=True)
+
+
+def _configure_logging() -> None:
+    requested_level = os.environ.get("LOG_LEVEL", "INFO").upper()
+    try:
+        logger.level(requested_level)
+        level = requested_level
+    except ValueError:
+        level = "INFO"
+
+    # Replace loguru's default DEBUG handler so records below LOG_LEVEL are discarded before formatting
+    logger.remove()
+    logger.add(
+        sys.stderr,
+        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <level>{message}</level>",
+        level=level,
+        backtrace=True,  # Show traceback for errors
+        diagnose=True,  # Show variables in traceback
+        catch=True,  # Catch exceptions in the logging handler
+    )
+    if level != requested_level:
+        logger.warning(f"Unknown LOG_LEVEL '{requested_level}', using INFO")
 
 
 class PowerPointTemplateError(Exception):
@@ -49,11 +102,139 @@ def load_data(data_path: str) -> Dict[str, Any]:
         raise PowerPointTemplateError(f"Failed to load data: {e}") from e
 
 
+def _stat_file(path: Path) -> Optional[os.stat_result]:
+    """Return the stat result for a regular file, or None if it is missing or not a file."""
+    try:
+        file_stat = path.stat()
+    except OSError:
+        return None
+    return file_stat if S_ISREG(file_stat.st_mode) else None
+
+
+def _get_image_size(image_path: Path, file_stat: os.stat_result) -> Tuple[int, int]:
+    """Read image dimensions, decoding the header only once per unique file version."""
+    return _read_image_size(image_path, file_stat.st_mtime_ns, file_stat.st_size)
+
+
+@lru_cache(maxsize=128)
+def _read_image_size(image_path: Path, mtime_ns: int, size: int) -> Tuple[int, int]:
+    # mtime/size are part of the cache key so a file regenerated at the same path is re-read
+    if imagesize is not None:
+        width, height = imagesize.get(image_path)
+        if width > 0 and height > 0:
+            return width, height
+    with Image.open(image_path) as img:
+        return img.size
+
+
+def _shape_may_contain_placeholder(shape) -> bool:
+    """Scan the shape's `<a:t>` elements for an opening brace without building `shape.text`.
+
+    Checks for a single `{` rather than `{{` so placeholders whose braces are split across
+    runs are not missed.
+    """
+    for t in shape._element.iter(_A_T):
+        if t.text and "{" in t.text:
+            return True
+    return False
+
+
+def _table_contains_text(table, text: str) -> bool:
+    """Check whether any cell of the table contains `text`."""
+    return any(text in cell.text for row in table.rows for cell in row.cells)
+
+
+def _set_cell_text_fast(cell, value: str) -> None:
+    """Write a single-line value into the cell's existing run, keeping paragraph formatting.
+
+    Falls back to `cell.text` when the cell holds more than one paragraph or run, or when
+    the value needs line breaks.
+    """
+    paragraphs = cell._tc.get_or_add_txBody().p_lst
+    if len(paragraphs) == 1 and "\n" not in value and "\v" not in value:
+        paragraph = paragraphs[0]
+        children = paragraph.content_children
+        if not children:
+            paragraph.add_r(value)
+            return
+        if len(children) == 1 and children[0].tag == _A_R:
+            children[0].text = value
+            return
+    cell.text = value
+
+
+class _SlideShapes(NamedTuple):
+    """A slide's shapes, bucketed by kind; `image_shapes` holds pictures and placeholders in slide order."""
+
+    shapes: List[Any]
+    tables: List[Any]
+    pictures: List[Any]
+    placeholders: List[Any]
+    image_shapes: List[Any]
+
+
 class PowerPointTemplate:
-    def __init__(self, template_path: str):
+    def __init__(self, template_path: str, slide_titles: Optional[Dict[str, int]] = None):
+        """Load the template; `slide_titles` (title -> slide index) skips the title scan when it fits the deck."""
         self.template_path = self._initialize_template(template_path)
-        self.prs = Presentation(self.template_path)
-        self.slide_map = self._create_slide_map()
+        with open(self.template_path, "rb", buffering=_IO_BUFFER_SIZE) as f:
+            self.prs = Presentation(f)
+        slide_map = self._slide_map_from_titles(slide_titles) if slide_titles is not None else None
+        self.slide_map = slide_map if slide_map is not None else self._create_slide_map()
+        self._text_pattern_cache: Dict[frozenset, re.Pattern] = {}
+        # Slides are processed concurrently; parts shared across the package (e.g. media) are not
+        self._package_lock = threading.Lock()
+
+    @classmethod
+    def from_cached(cls, template_path: str, cache_dir: str = ".pptx_cache") -> "PowerPointTemplate":
+        """Create a template, reusing the slide title indices cached for this template version.
+
+        `Presentation` objects hold lxml elements and cannot be pickled, so the on-disk cache
+        stores the slide title -> index mapping as JSON, keyed by template path, mtime and size.
+        """
+        path = Path(template_path)
+        try:
+            stat = path.stat()
+        except OSError:
+            # Let __init__ report the missing template
+            return cls(template_path)
+        key = hashlib.blake2b(
+            f"{path.resolve()}:{stat.st_mtime_ns}:{stat.st_size}".encode(), digest_size=16
+        ).hexdigest()
+
+        cache_file = Path(cache_dir) / f"{key}.json"
+        slide_titles = None
+        if cache_file.is_file():
+            try:
+                with open(cache_file) as f:
+                    slide_titles = json.load(f)
+                logger.debug(f"Loaded slide map from cache: {cache_file}")
+            except (OSError, ValueError):
+                logger.warning(f"Ignoring unreadable slide map cache: {cache_file}")
+
+        template = cls(template_path, slide_titles)
+
+        current_titles = {title: index for title, (index, _) in template.slide_map.items()}
+        if current_titles != slide_titles:
+            try:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(cache_file, "w") as f:
+                    json.dump(current_titles, f)
+            except OSError:
+                logger.warning(f"Could not write slide map cache: {cache_file}")
+        return template
+
+    def _slide_map_from_titles(self, slide_titles: Any) -> Optional[Dict[str, Tuple[int, Any]]]:
+        """Rebuild the slide map from cached title indices, or return None if they do not fit this deck."""
+        slides = self.prs.slides
+        slide_count = len(slides)
+        if not isinstance(slide_titles, dict) or not all(
+            isinstance(title, str) and type(index) is int and 0 <= index < slide_count
+            for title, index in slide_titles.items()
+        ):
+            logger.warning("Ignoring slide map cache that does not match the template")
+            return None
+        return {sys.intern(title): (index, slides[index]) for title, index in slide_titles.items()}
 
     def _initialize_template(self, template_path: str) -> str:
         if not Path(template_path).exists():
@@ -62,15 +243,18 @@ class PowerPointTemplate:
         logger.debug(f"Template file found: {template_path}")
         return template_path
 
-    def _create_slide_map(self) -> Dict[str, Any]:
+    def _create_slide_map(self) -> Dict[str, Tuple[int, Any]]:
+        """Map slide titles to `(index, slide)` tuples."""
         try:
             logger.debug("Creating slide map")
             slide_map = {}
             for i, slide in enumerate(self.prs.slides):
-                if slide.shapes.title:
-                    logger.debug(f"Slide {i} has title: {slide.shapes.title.text}")
-                    title = slide.shapes.title.text
-                    slide_map[title] = {"index": i, "slide": slide}
+                title_shape = slide.shapes.title
+                if title_shape is None:
+                    continue
+                title = title_shape.text
+                logger.debug("Slide {} has title: {}", i, title)
+                slide_map[sys.intern(title)] = (i, slide)
             logger.debug(f"Slide map created")
             return slide_map
         except Exception as e:
@@ -79,143 +263,279 @@ class PowerPointTemplate:
 
     def apply_data(self, data_dict: Dict[str, Any]) -> None:
         try:
-            for slide_name, slide_data in data_dict.items():
-                logger.debug(f"Try to apply data to slide: '{slide_name}'")
-                if slide_name not in self.slide_map:
-                    logger.warning(f"Slide '{slide_name}' not found in template")
-                    continue
-
-                slide = self.slide_map[slide_name]["slide"]
-
-                try:
-                    if "text" in slide_data:
-                        logger.debug(f"Input data contains text data for slide: '{slide_name}'")
-                        self._replace_text_placeholders(slide, slide_data["text"])
-
-                    if "tables" in slide_data:
-                        logger.debug(f"Input data contains table data for slide: '{slide_name}'")
-                        self._update_tables(slide, slide_data["tables"])
-
-                    if "images" in slide_data:
-                        logger.debug(f"Input data contains image data for slide: '{slide_name}'")
-                        self._replace_images(slide, slide_data["images"])
-                except Exception as e:
-                    logger.exception(f"Error processing slide '{slide_name}'")
-                    continue
+            max_workers = min(_MAX_SLIDE_WORKERS, os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                list(executor.map(lambda item: self._process_slide(*item), data_dict.items()))
         except Exception as e:
             logger.exception("Failed to apply data to presentation")
             raise PowerPointTemplateError(f"Failed to apply data: {e}") from e
 
-    def _replace_text_placeholders(self, slide, text_data: Dict[str, str]) -> None:
+    def _process_slide(self, slide_name: str, slide_data: Dict[str, Any]) -> None:
+        logger.debug("Try to apply data to slide: '{}'", slide_name)
+        slide_name = sys.intern(slide_name)
+        if slide_name not in self.slide_map:
+            logger.warning(f"Slide '{slide_name}' not found in template")
+            return
+
+        if not isinstance(slide_data, dict):
+            logger.warning(f"Data for slide '{slide_name}' is not a mapping")
+            return
+
+        if not slide_data.keys() & _SECTION_HANDLERS.keys():
+            logger.debug("No text, table or image data for slide: '{}'", slide_name)
+            return
+
+        slide = self.slide_map[slide_name][1]
+
+        try:
+            slide_shapes = self._classify_shapes(slide)
+        except Exception:
+            logger.exception(f"Error processing slide '{slide_name}'")
+            return
+
+        for key, data in slide_data.items():
+            handler = _SECTION_HANDLERS.get(key)
+            if handler is None:
+                continue
+            logger.debug("Input data contains {} data for slide: '{}'", key, slide_name)
+            try:
+                getattr(self, handler)(slide, data, slide_shapes)
+            except Exception:
+                logger.exception(f"Error processing {key} data for slide '{slide_name}'")
+
+    @staticmethod
+    def _classify_shapes(slide) -> _SlideShapes:
+        """Materialize the slide's shapes and bucket them by kind in a single pass."""
+        shapes = list(slide.shapes)
+        tables, pictures, placeholders, image_shapes = [], [], [], []
+        for shape in shapes:
+            if shape.has_table:
+                tables.append(shape)
+            shape_type = shape.shape_type
+            if shape_type == _PICTURE:
+                pictures.append(shape)
+                image_shapes.append(shape)
+            elif shape_type == _PLACEHOLDER:
+                placeholders.append(shape)
+                image_shapes.append(shape)
+        return _SlideShapes(shapes, tables, pictures, placeholders, image_shapes)
+
+    def _get_text_pattern(self, text_data: Dict[str, str]) -> re.Pattern:
+        """Return a compiled `{{(key1|key2|...)}}` pattern, cached per set of keys."""
+        keys = frozenset(text_data)
+        pattern = self._text_pattern_cache.get(keys)
+        if pattern is None:
+            alternatives = "|".join(map(re.escape, keys))
+            pattern = _placeholder_re.compile(r"\{\{(" + alternatives + r")\}\}")
+            self._text_pattern_cache[keys] = pattern
+        return pattern
+
+    def _replace_text_placeholders(self, slide, text_data: Dict[str, str], slide_shapes: _SlideShapes) -> None:
         try:
-            for shape in slide.shapes:
-                if not hasattr(shape, "text"):
+            if not text_data:
+                return
+
+            pattern = self._get_text_pattern(text_data)
+            # Convert values once so the substitution callback is a plain dict lookup
+            values = {key: value if isinstance(value, str) else str(value) for key, value in text_data.items()}
+
+            def replace(match: re.Match) -> str:
+                value = values[match.group(1)]
+                _lazy_logger.debug("Replacing placeholder: '{}' with '{}'", match.group, lambda: value)
+                return value
+
+            for shape in slide_shapes.shapes:
+                if not shape.has_text_frame:
                     continue
 
-                try:
-                    text = shape.text
-                    for key, value in text_data.items():
-                        placeholder = "{{" + key + "}}"
-                        if placeholder in text:
-                            logger.debug(f"Replacing placeholder: '{placeholder}' with '{value}'")
-                            text = text.replace(placeholder, str(value))
-
-                    if text != shape.text:
-                        shape.text = text
-                except Exception as e:
-                    logger.exception("Error processing shape in slide")
+                if not _shape_may_contain_placeholder(shape):
                     continue
+
+                for paragraph in shape.text_frame.paragraphs:
+                    self._replace_in_paragraph(paragraph, pattern, replace)
         except Exception as e:
             logger.exception("Failed to replace text placeholders")
             raise PowerPointTemplateError(f"Failed to replace text: {e}") from e
 
-    def _update_tables(self, slide, tables_data: Dict[str, Any]) -> None:
+    @staticmethod
+    def _replace_in_paragraph(paragraph, pattern: re.Pattern, replace: Callable[[re.Match], str]) -> None:
+        """Substitute placeholders run by run so that run formatting is preserved.
+
+        Runs are grouped into segments delimited by `a:br`/`a:fld`. Matches are found once on each
+        segment's original text; a placeholder split across runs merges only the runs it spans.
+        """
+        segment: List[Any] = []
+        for child in paragraph._p.content_children:
+            if child.tag == _A_R:
+                segment.append(child)
+                continue
+            PowerPointTemplate._replace_in_segment(segment, pattern, replace)
+            segment = []
+        PowerPointTemplate._replace_in_segment(segment, pattern, replace)
+
+    @staticmethod
+    def _replace_in_segment(runs: List[Any], pattern: re.Pattern, replace: Callable[[re.Match], str]) -> None:
+        texts = [r.text for r in runs]
+        text = "".join(texts)
+        if "{{" not in text:
+            return
+        matches = list(pattern.finditer(text))
+        if not matches:
+            return
+
+        starts = []
+        offset = 0
+        for run_text in texts:
+            starts.append(offset)
+            offset += len(run_text)
+
+        # Group runs touched by matches: [first, last] run indices, merged where matches share a run
+        groups: List[List[int]] = []
+        for match in matches:
+            first = bisect_right(starts, match.start()) - 1
+            last = bisect_right(starts, match.end() - 1) - 1
+            if groups and first <= groups[-1][1]:
+                groups[-1][1] = max(groups[-1][1], last)
+            else:
+                groups.append([first, last])
+
+        match_iter = iter(matches)
+        match = next(match_iter, None)
+        for first, last in groups:
+            group_end = starts[last] + len(texts[last])
+            pos = starts[first]
+            parts = []
+            while match is not None and match.start() < group_end:
+                parts.append(text[pos : match.start()])
+                parts.append(replace(match))
+                pos = match.end()
+                match = next(match_iter, None)
+            parts.append(text[pos:group_end])
+
+            runs[first].text = "".join(parts)
+            for r in runs[first + 1 : last + 1]:
+                r.getparent().remove(r)
+
+    def _update_tables(self, slide, tables_data: Dict[str, Any], slide_shapes: _SlideShapes) -> None:
         try:
-            table_shapes = [shape for shape in slide.shapes if shape.has_table]
+            table_shapes = slide_shapes.tables
             if not table_shapes:
                 raise TableNotFoundError("No tables found in slide")
 
-            logger.debug(f"Found {len(table_shapes)} tables in slide")
+            logger.debug("Found {} tables in slide", len(table_shapes))
 
-            for table_index, table_data in tables_data.items():
-                try:
-                    table_index = int(table_index)
-                    table = None
+            for table_key, table_data in tables_data.items():
+                if not isinstance(table_data, dict):
+                    logger.warning(f"Invalid table entry: {table_key}")
+                    continue
 
-                    if table_index < len(table_shapes):
-                        table = table_shapes[table_index].table
-                    else:
-                        for shape in table_shapes:
-                            if (hasattr(shape, "name") and shape.name == table_index) or (
-                                table_data.get("identifier") and table_data["identifier"] in shape.text
-                            ):
-                                table = shape.table
-                                break
-
-                    if table and "data" in table_data:
-                        rows = min(len(table_data["data"]), len(table.rows))
-                        for r in range(rows):
-                            row_data = table_data["data"][r]
-                            cols = min(len(row_data), len(table.columns))
-                            for c in range(cols):
-                                table.cell(r, c).text = str(row_data[c])
-                    else:
-                        logger.warning(f"Table {table_index} not found or no data provided")
-                except Exception as e:
-                    logger.exception(f"Error updating table {table_index}")
+                # Keys are a table index, or else a table shape name; "identifier" matches cell text
+                table_key = str(table_key)
+                table = None
+
+                if table_key.isdigit() and int(table_key) < len(table_shapes):
+                    table = table_shapes[int(table_key)].table
+                else:
+                    identifier = table_data.get("identifier")
+                    for shape in table_shapes:
+                        if shape.name == table_key or (identifier and _table_contains_text(shape.table, identifier)):
+                            table = shape.table
+                            break
+
+                if not table or "data" not in table_data:
+                    logger.warning(f"Table {table_key} not found or no data provided")
+                    continue
+
+                data = table_data["data"]
+                if not isinstance(data, (list, tuple)):
+                    logger.warning(f"Data of table {table_key} is not a list")
                     continue
+
+                rows = min(len(data), len(table.rows))
+                for r in range(rows):
+                    row_data = data[r]
+                    if not isinstance(row_data, (list, tuple)):
+                        logger.warning(f"Row {r} of table {table_key} is not a list")
+                        continue
+                    cols = min(len(row_data), len(table.columns))
+                    for c in range(cols):
+                        value = row_data[c]
+                        _set_cell_text_fast(table.cell(r, c), value if isinstance(value, str) else str(value))
         except TableNotFoundError as e:
             logger.warning(str(e))
         except Exception as e:
             logger.exception("Failed to update tables")
             raise PowerPointTemplateError(f"Failed to update tables: {e}") from e
 
-    def _replace_images(self, slide, images_data: Dict[str, str]) -> None:
+    def _replace_images(self, slide, images_data: Dict[str, str], slide_shapes: _SlideShapes) -> None:
         try:
+            pictures, placeholders = slide_shapes.pictures, slide_shapes.placeholders
+            resolved = {}
+            for name, path in images_data.items():
+                if not isinstance(path, str):
+                    continue
+                path = Path(path)
+                file_stat = _stat_file(path)
+                if file_stat is not None:
+                    resolved[name] = (path, file_stat)
+
+            # Name/alt_text lookup table; the first shape in slide order wins on duplicates
+            shapes_by_name: Dict[str, Any] = {}
+            for shape in slide_shapes.image_shapes:
+                shapes_by_name.setdefault(shape.name, shape)
+                alt_text = getattr(shape, "alt_text", None)
+                if alt_text:
+                    shapes_by_name.setdefault(alt_text, shape)
+
+            replaced = set()
+            # Bytes of each image file, read once per call so repeated paths are not re-read
+            image_bytes_by_path: Dict[Path, bytes] = {}
             for image_name, image_path in images_data.items():
-                try:
-                    if not os.path.exists(image_path):
-                        raise ImageNotFoundError(f"Image file '{image_path}' not found")
-
-                    if image_name.isdigit():
-                        image_index = int(image_name)
-                        images = [shape for shape in slide.shapes if shape.shape_type == MSO_SHAPE_TYPE.PICTURE]
-                        if image_index < len(images):
-                            self._replace_single_image(slide, images[image_index], image_path)
-                            continue
-                        placeholders = [
-                            shape for shape in slide.shapes if shape.shape_type == MSO_SHAPE_TYPE.PLACEHOLDER
-                        ]
-                        if image_index < len(placeholders):
-                            self._replace_single_image(slide, placeholders[image_index], image_path)
-                            continue
-                        logger.warning(f"No suitable image placeholder found for index {image_index}")
+                if not isinstance(image_path, str):
+                    logger.warning(f"Image path for '{image_name}' is not a string: {image_path!r}")
+                    continue
+                if image_name not in resolved:
+                    logger.warning(f"Image file '{image_path}' not found")
+                    continue
+
+                if image_name.isdigit():
+                    image_index = int(image_name)
+                    if image_index < len(pictures):
+                        shape = pictures[image_index]
+                    elif image_index < len(placeholders):
+                        shape = placeholders[image_index]
                     else:
-                        found = False
-                        for shape in slide.shapes:
-                            if (
-                                shape.shape_type == MSO_SHAPE_TYPE.PICTURE
-                                or shape.shape_type == MSO_SHAPE_TYPE.PLACEHOLDER
-                            ) and (
-                                (hasattr(shape, "name") and shape.name == image_name)
-                                or (hasattr(shape, "alt_text") and shape.alt_text == image_name)
-                            ):
-                                self._replace_single_image(slide, shape, image_path)
-                                found = True
-                                break
-                        if not found:
-                            logger.warning(f"No image placeholder found with name/alt_text: {image_name}")
-                except ImageNotFoundError as e:
-                    logger.warning(str(e))
+                        logger.warning(f"No suitable image placeholder found for index {image_index}")
+                        continue
+                else:
+                    shape = shapes_by_name.get(image_name)
+                    if shape is None:
+                        logger.warning(f"No image placeholder found with name/alt_text: {image_name}")
+                        continue
+
+                # The shape buckets are a snapshot; a shape replaced earlier in this call is detached
+                if shape.shape_id in replaced:
+                    logger.warning(f"Image placeholder for '{image_name}' was already replaced")
                     continue
-                except Exception as e:
-                    logger.exception(f"Error replacing image {image_name}")
+
+                image_path, file_stat = resolved[image_name]
+                try:
+                    image_size = _get_image_size(image_path, file_stat)
+                    image_bytes = image_bytes_by_path.get(image_path)
+                    if image_bytes is None:
+                        image_bytes = image_bytes_by_path[image_path] = image_path.read_bytes()
+                except (OSError, UnidentifiedImageError):
+                    logger.warning(f"Image file '{image_path}' could not be read")
                     continue
+                self._replace_single_image(slide, shape, image_path, image_size, image_bytes)
+                replaced.add(shape.shape_id)
         except Exception as e:
             logger.exception("Failed to replace images")
             raise PowerPointTemplateError(f"Failed to replace images: {e}") from e
 
-    def _replace_single_image(self, slide, shape, image_path: str) -> None:
+    def _replace_single_image(
+        self, slide, shape, image_path: Path, image_size: Tuple[int, int], image_bytes: bytes
+    ) -> None:
         """Replace a single image with error handling."""
         try:
             left, top, box_width, box_height = shape.left, shape.top, shape.width, shape.height
@@ -223,20 +543,21 @@ class PowerPointTemplate:
             sp = shape._element
             sp.getparent().remove(sp)
 
-            with Image.open(image_path) as img:
-                img_width, img_height = img.size
-
-            width_ratio = box_width / img_width
-            height_ratio = box_height / img_height
-            scale = min(width_ratio, height_ratio)
+            img_width, img_height = image_size
 
-            new_width = int(img_width * scale)
-            new_height = int(img_height * scale)
+            # Fit inside the box preserving aspect ratio; compare cross-products to stay in integers
+            if box_width * img_height <= box_height * img_width:
+                new_width, new_height = box_width, img_height * box_width // img_width
+            else:
+                new_width, new_height = img_width * box_height // img_height, box_height
 
-            new_left = left + int((box_width - new_width) / 2)
-            new_top = top + int((box_height - new_height) / 2)
+            new_left = left + (box_width - new_width) // 2
+            new_top = top + (box_height - new_height) // 2
 
-            slide.shapes.add_picture(image_path, new_left, new_top, new_width, new_height)
+            with self._package_lock:
+                picture = slide.shapes.add_picture(BytesIO(image_bytes), new_left, new_top, new_width, new_height)
+            # A stream has no filename, so restore the description python-pptx derives from the path
+            picture._element.nvPicPr.cNvPr.set("descr", image_path.name)
         except Exception as e:
             logger.exception("Failed to replace single image")
             raise PowerPointTemplateError(f"Failed to replace single image: {e}") from e
@@ -244,7 +565,8 @@ class PowerPointTemplate:
     def save(self, output_path: str) -> None:
         """Save the presentation with error handling."""
         try:
-            self.prs.save(output_path)
+            with open(output_path, "wb", buffering=_IO_BUFFER_SIZE) as f:
+                self.prs.save(f)
             logger.info(f"Presentation saved as {output_path}")
         except Exception as e:
             logger.exception("Failed to save presentation")
@@ -252,6 +574,7 @@ class PowerPointTemplate:
 
 
 def main():
+    _configure_logging()
     try:
         logger.info("Starting PowerPoint template application")
         template_path = "example-presentation.pptx"